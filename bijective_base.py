@@ -1,8 +1,9 @@
 #!/usr/bin/python3
 # https://codegolf.stackexchange.com/q/54105
-__all__ = ('encode', 'decode')
+__all__ = ('encode', 'decode', 'encode_range', 'DigitCodec')
 import re
 import sys
+import math
 import string
 import argparse
 import itertools
@@ -11,17 +12,109 @@ import collections
 import collections.abc
 
 
-class DigitMappings(collections.defaultdict):
+class DigitCodec(collections.abc.Mapping):
+	"""Maps the digits of an alphabet to their values 1 to len(digits)
 
-	def __init__(self):
-		super().__init__()
+	Whole strings are converted with str.translate() and bytes.translate()
+	tables instead of one character at a time.
+	"""
+
+	__slots__ = ('digits', '_values', '_decode_table', '_delete_table',
+		'_encode_table')
+
+
+	def __init__(self, digits):
+		if not (digits and isinstance(digits, str)):
+			raise ValueError('Expected a non-empty string, got {!r}'.format(digits))
+		self.digits = digits
+		self._values = dict(zip(digits, itertools.count(1)))
+		self._decode_table = str.maketrans(
+			{ c: chr(v) for c, v in self._values.items() })
+		self._delete_table = dict.fromkeys(map(ord, digits))
+		if len(digits) < 256 and max(map(ord, digits)) < 256:
+			self._encode_table = bytes.maketrans(
+				bytes(range(1, len(digits) + 1)), digits.encode('latin-1'))
+		else:
+			self._encode_table = None
+
+
+	def __getitem__(self, key):
+		return self._values[key]
+
+
+	def __iter__(self):
+		return iter(self._values)
+
+
+	def __len__(self):
+		return len(self._values)
+
+
+	def values_of(self, s):
+		"""Returns a sequence of the digit values of the string s"""
+		if isinstance(s, (bytes, bytearray)):
+			s = s.decode('latin-1')
+		invalid = s.translate(self._delete_table)
+		if invalid:
+			raise KeyError(invalid[0])
+		s = s.translate(self._decode_table)
+		if len(self._values) < 256:
+			return s.encode('latin-1')
+		return list(map(ord, s))
+
+
+	def join(self, values):
+		"""Returns the string of the digits with the given values"""
+		if self._encode_table is not None:
+			return bytes(values).translate(self._encode_table).decode('latin-1')
+		return ''.join([self.digits[v - 1] for v in values])
+
+
+class DigitMappings:
+	"""A least-recently-used cache of DigitCodec objects keyed by alphabet"""
+
+	CacheInfo = collections.namedtuple(
+		'CacheInfo', ('hits', 'misses', 'maxsize', 'currsize'))
+
+
+	def __init__(self, maxsize=64):
+		self.maxsize = maxsize
+		self._codecs = collections.OrderedDict()
+		self.hits = self.misses = 0
+
+
+	def __getitem__(self, key):
+		codec = self._codecs.get(key)
+		if codec is not None:
+			self._codecs.move_to_end(key)
+			self.hits += 1
+			return codec
 
-	def __missing__(self, key):
 		if not (key and isinstance(key, str)):
-			raise KeyError
-		value = dict(zip(key, itertools.count(1)))
-		self[key] = value
-		return value
+			raise KeyError(key)
+		self.misses += 1
+		codec = self._codecs[key] = DigitCodec(key)
+		if len(self._codecs) > self.maxsize:
+			self._codecs.popitem(last=False)
+		return codec
+
+
+	def __contains__(self, key):
+		return key in self._codecs
+
+
+	def __len__(self):
+		return len(self._codecs)
+
+
+	def cache_info(self):
+		return self.CacheInfo(
+			self.hits, self.misses, self.maxsize, len(self._codecs))
+
+
+	def cache_clear(self):
+		self._codecs.clear()
+		self.hits = self.misses = 0
 
 
 digit_mappings = DigitMappings()
@@ -39,20 +132,182 @@ def decode(s, digits=digit_mappings[string.ascii_uppercase]):
 			values = digits
 		assert sorted(values) == list(range(1, base + 1))
 
-	return functools.reduce(
-		functools.partial(muladd, base), map(digits.__getitem__, s))
+	if (isinstance(digits, DigitCodec) and
+		isinstance(s, (str, bytes, bytearray))
+	):
+		values = digits.values_of(s)
+	else:
+		values = list(map(digits.__getitem__, s))
+
+	if len(values) < DIVIDE_AND_CONQUER_DIGITS:
+		return functools.reduce(functools.partial(muladd, base), values)
+	return _decode_dc(values, base)
 
 
 def muladd(a, b, c):
 	return a * b + c
 
 
+# Inputs with at least this many digits are converted by divide and conquer.
+DIVIDE_AND_CONQUER_DIGITS = 1 << 9
+_SIMPLE_CHUNK_DIGITS = 1 << 6
+
+
+def _decode_dc(values, base):
+	"""Decodes a list of bijective digit values (1 to base)
+
+	An m-digit bijective numeral equals the ordinary base-`base` numeral of
+	its digit values minus 1 plus the smallest m-digit value
+	(base**m - 1) / (base - 1). The ordinary numeral is evaluated by
+	recursively splitting it in halves and joining them with a power of the
+	base.
+	"""
+	m = len(values)
+	return (_ordinary_value([v - 1 for v in values], 0, m, base, {}) +
+		(base**m - 1) // (base - 1))
+
+
+def _ordinary_value(digits, lo, hi, base, powers):
+	if hi - lo <= _SIMPLE_CHUNK_DIGITS:
+		return functools.reduce(
+			functools.partial(muladd, base), digits[lo:hi], 0)
+	h = (hi - lo) // 2
+	return (_ordinary_value(digits, lo, hi - h, base, powers) *
+		_power(base, h, powers) +
+		_ordinary_value(digits, hi - h, hi, base, powers))
+
+
+def _power(base, e, powers):
+	p = powers.get(e)
+	if p is None:
+		p = powers[e] = base**e
+	return p
+
+
+def _encode_dc(n, base):
+	"""Returns the bijective digit values of n, most significant first
+
+	The values range from 1 to base; this is the inverse of _decode_dc().
+	"""
+	# The number of digits m is the largest with (base**m - 1) / (base - 1) <= n.
+	x = (base - 1) * n + 1
+	m = max(int(x.bit_length() / math.log2(base)) - 1, 0)
+	while base**(m + 1) <= x:
+		m += 1
+	values = []
+	_ordinary_digits(n - (base**m - 1) // (base - 1), m, base, {}, values)
+	return [d + 1 for d in values]
+
+
+def _ordinary_digits(x, width, base, powers, out):
+	"""Appends the width ordinary digits of x, most significant first"""
+	if width <= _SIMPLE_CHUNK_DIGITS:
+		chunk = [0] * width
+		for i in range(width - 1, -1, -1):
+			x, chunk[i] = divmod(x, base)
+		out += chunk
+		return
+	h = width // 2
+	high, low = _divmod(x, _power(base, h, powers))
+	_ordinary_digits(high, width - h, base, powers, out)
+	_ordinary_digits(low, h, base, powers, out)
+
+
+# Divisions with operands of fewer bits than this use the built-in divmod().
+_DIVMOD_BITS = 1 << 12
+
+
+def _divmod(a, b):
+	"""Like divmod() for a >= 0 and b > 0 but subquadratic in their size
+
+	The built-in division of CPython before 3.12 is quadratic. This is the
+	recursive division of Burnikel and Ziegler on top of the Karatsuba
+	multiplication of ints: a is split into digits of base 2**n, where n is the
+	bit length of b, and each 2n-by-n digit division recurses into halves.
+	"""
+	n = b.bit_length()
+	if a.bit_length() - n <= _DIVMOD_BITS:
+		return divmod(a, b)
+	mask = (1 << n) - 1
+	q = r = 0
+	for shift in range((a.bit_length() - 1) // n * n, -1, -n):
+		q_digit, r = _div2n1n(r << n | a >> shift & mask, b, n)
+		q = q << n | q_digit
+	return q, r
+
+
+def _div2n1n(a, b, n):
+	"""Returns divmod(a, b) for a b of n bits and 0 <= a < b << n"""
+	if a.bit_length() - n <= _DIVMOD_BITS:
+		return divmod(a, b)
+	pad = n & 1
+	if pad:
+		a <<= 1
+		b <<= 1
+		n += 1
+	h = n >> 1
+	mask = (1 << h) - 1
+	b1, b2 = b >> h, b & mask
+	q1, r = _div3n2n(a >> n, a >> h & mask, b, b1, b2, h)
+	q2, r = _div3n2n(r, a & mask, b, b1, b2, h)
+	return q1 << h | q2, r >> pad
+
+
+def _div3n2n(a12, a3, b, b1, b2, n):
+	if a12 >> n == b1:
+		q, r = (1 << n) - 1, a12 - (b1 << n) + b1
+	else:
+		q, r = _div2n1n(a12, b1, n)
+	r = (r << n | a3) - q * b2
+	while r < 0:
+		q -= 1
+		r += b
+	return q, r
+
+
 def encode(n, digits=string.ascii_uppercase):
+	if (isinstance(n, int) and n > 0 and len(digits) > 1 and
+		n.bit_length() >= DIVIDE_AND_CONQUER_DIGITS * math.log2(len(digits))
+	):
+		values = _encode_dc(n, len(digits))
+		if isinstance(digits, str):
+			return digit_mappings[digits].join(values)
+		return tuple(digits[v - 1] for v in values)
 	return (
 		(''.join if isinstance(digits, str) else tuple)(
 			_encode_impl(n, digits))[::-1])
 
 
+def encode_range(start, stop, digits=string.ascii_uppercase):
+	"""Yields encode(n, digits) for every n in range(start, stop)
+
+	The label is kept in a buffer and incremented in place with a bijective
+	carry, which only touches the trailing maximal digits.
+	"""
+	if not (isinstance(start, int) and isinstance(stop, int)):
+		raise TypeError
+	if start <= 0 or len(digits) <= 1:
+		raise ValueError
+	if stop <= start:
+		return
+
+	join = ''.join if isinstance(digits, str) else tuple
+	successors = dict(zip(digits, digits[1:]))
+	first = digits[0]
+	label = list(encode(start, digits))
+
+	for _ in range(start, stop):
+		yield join(label)
+		i = len(label) - 1
+		while i >= 0 and label[i] not in successors:
+			label[i] = first
+			i -= 1
+		if i >= 0:
+			label[i] = successors[label[i]]
+		else:
+			label.insert(0, first)
+
+
 def _encode_impl(n, digits):
 	base = len(digits)
 
@@ -72,15 +327,67 @@ def identity(x):
 	return x
 
 
+def benchmark(sizes=(10, 10**2, 10**3, 10**4, 10**5, 10**6),
+	simple_limit=10**5, digits=string.ascii_uppercase, file=None
+):
+	"""Times the simple and the divide-and-conquer conversions
+
+	Labels have the given digit counts; the simple conversions are skipped
+	above simple_limit digits.
+	"""
+	import time, random
+	if file is None:
+		file = sys.stdout
+	base = len(digits)
+	mapping = digit_mappings[digits]
+
+	def timed(func, *args):
+		t = time.perf_counter()
+		result = func(*args)
+		return result, time.perf_counter() - t
+
+	print('{:>8s} {:>12s} {:>12s} {:>12s} {:>12s}'.format('digits',
+			'decode', 'decode_dc', 'encode', 'encode_dc'),
+		file=file)
+	for size in sizes:
+		s = ''.join(random.choice(digits) for _ in range(size))
+		values = list(map(mapping.__getitem__, s))
+		n, t_decode_dc = timed(_decode_dc, values, base)
+		e, t_encode_dc = timed(_encode_dc, n, base)
+		assert e == values
+
+		if size <= simple_limit:
+			n2, t_decode = timed(functools.reduce,
+				functools.partial(muladd, base), values)
+			e2, t_encode = timed(
+				lambda: ''.join(_encode_impl(n, digits))[::-1])
+			assert n2 == n and e2 == s
+		else:
+			t_decode = t_encode = math.nan
+
+		print('{:8d} {:12.6f} {:12.6f} {:12.6f} {:12.6f}'.format(
+				size, t_decode, t_decode_dc, t_encode, t_encode_dc),
+			file=file)
+
+
 def parse_args(args):
 	ap = argparse.ArgumentParser()
-	ap.add_argument('numbers', nargs='+')
+	ap.add_argument('numbers', nargs='*')
 
 	for m in ('encode', 'decode'):
 		ap.add_argument('-' + m[0], '--' + m, metavar='DIGITS',
 			nargs='?', type=parse_digits, const=string.ascii_uppercase)
+	ap.add_argument('--benchmark', action='store_true',
+		help='Time the conversions for growing label lengths')
+	ap.add_argument('--range', metavar='A:B', type=parse_range,
+		help='Encode every number in [A, B)')
 
 	args = ap.parse_args(args)
+	if not (args.numbers or args.benchmark or args.range):
+		ap.error('the following arguments are required: numbers')
+	if args.range and args.decode is not None:
+		ap.error('--range cannot be combined with --decode')
+	args.range_digits = args.encode or string.ascii_uppercase
 	if args.encode is None and args.decode is None:
 		args.encode = string.ascii_uppercase
 
@@ -107,6 +414,13 @@ digit_sets = {
 }
 
 
+def parse_range(s):
+	start, sep, stop = s.partition(':')
+	if not sep:
+		raise ValueError
+	return int(start), int(stop)
+
+
 def parse_digits(s):
 	s = re.sub(r'\[:([\w-]*):\]', lambda m: digit_sets[m.group(1)], s)
 	if not 1 < len(s) == len(frozenset(s)):
@@ -117,9 +431,22 @@ def parse_digits(s):
 
 def main(args=None):
 	args = parse_args(args)
+	if args.benchmark:
+		benchmark()
+	if args.range:
+		_write_range(*args.range, args.range_digits)
 	for s in args.numbers:
 		print(s, '->', args.encode(args.decode(s)))
 
 
+def _write_range(start, stop, digits, chunk_size=1 << 12, file=None):
+	if file is None:
+		file = sys.stdout
+	lines = map('{} -> {}\n'.format,
+		range(start, stop), encode_range(start, stop, digits))
+	for chunk in iter(lambda: ''.join(itertools.islice(lines, chunk_size)), ''):
+		file.write(chunk)
+
+
 if __name__ == '__main__':
 	main()
@@ -1,10 +1,19 @@
 #!/usr/bin/python3
 # https://codegolf.stackexchange.com/q/168097
-__all__ = ('MIN_BOUNCY', 'is_bouncy', 'sum_bouncy')
+__all__ = ('MIN_BOUNCY', 'is_bouncy', 'sum_bouncy', 'count_bouncy_below',
+	'sum_bouncy_below', 'nth_bouncy', 'iter_bouncy', 'bouncy_block',
+	'is_bouncy_many')
 
 import sys
 import operator
 import itertools
+import functools
+
+try:
+	import numpy as np
+	from digit_matrix import digit_matrix
+except ImportError:
+	np = None
 
 
 MIN_BOUNCY = 101
@@ -74,14 +83,185 @@ def is_bouncy(n):
 
 def _is_bouncy_unchecked(n):
 	assert isinstance(n, int) and n >= MIN_BOUNCY
-	return is_monotonuous(digits(n), 0)
+	return not is_monotonuous(digits(n), 0)
+
+
+def sum_bouncy(count, base=10):
+	"""Returns the sum of the first count bouncy numbers"""
+	if count <= 0:
+		return 0
+	return sum_bouncy_below(nth_bouncy(count, base) + 1, base)
+
+
+def bouncy_block(start, stop, base=10):
+	"""Returns a boolean array telling which numbers in [start, stop) are bouncy
+
+	The block is decomposed into a digit matrix (least significant digit
+	first) whose differences along the digit axis are masked to the actual
+	length of each number.
+	"""
+	assert 0 <= start <= stop <= np.iinfo(np.int64).max
+	return _is_bouncy_matrix(
+		*digit_matrix(np.arange(start, stop, dtype=np.int64), base))
+
+
+def is_bouncy_many(a, base=10):
+	"""Returns a boolean array telling which items of a are bouncy"""
+	return _is_bouncy_matrix(*digit_matrix(np.abs(np.asarray(a)), base))
+
+
+def _is_bouncy_matrix(m, lengths):
+	slopes = np.sign(np.diff(m, axis=1))
+	slopes[np.arange(1, m.shape[1]) >= lengths[:, np.newaxis]] = 0
+	return np.any(slopes > 0, axis=1) & np.any(slopes < 0, axis=1)
+
+
+def iter_bouncy(start=0, stop=None, block=1 << 16, base=10):
+	"""Yields the bouncy numbers in [start, stop) in ascending order"""
+	assert isinstance(start, int) and start >= 0
+	if np is None or stop is not None and stop > np.iinfo(np.int64).max:
+		return _iter_bouncy_reference(start, stop, base)
+	return _iter_bouncy_numpy(start, stop, block, base)
+
+
+def _iter_bouncy_numpy(start, stop, block, base):
+	lo = max(start, base * base + 1)
+	while stop is None or lo < stop:
+		hi = lo + block if stop is None else min(lo + block, stop)
+		yield from (np.flatnonzero(bouncy_block(lo, hi, base)) + lo).tolist()
+		lo = hi
 
 
-def sum_bouncy(count):
+def _iter_bouncy_reference(start, stop, base):
+	return (n
+		for n in itertools.takewhile(
+			lambda n: stop is None or n < stop,
+			itertools.count(max(start, base * base + 1)))
+		if not is_monotonuous(digits(n, base), 0))
+
+
+def _sum_bouncy_reference(count):
 	return sum(itertools.islice(
 		filter(_is_bouncy_unchecked, itertools.count(MIN_BOUNCY)), count))
 
 
+def count_bouncy_below(n, base=10):
+	"""Returns the number of bouncy numbers in [1, n)"""
+	return max(n - 1, 0) - _monotonuous_below(n, base)[0]
+
+
+def sum_bouncy_below(n, base=10):
+	"""Returns the sum of the bouncy numbers in [1, n)"""
+	return max(n * (n - 1) // 2, 0) - _monotonuous_below(n, base)[1]
+
+
+def nth_bouncy(k, base=10):
+	"""Returns the k-th bouncy number, counting from 1"""
+	assert isinstance(k, int)
+	if k <= 0:
+		raise ValueError('Expected a positive index, got {:d}'.format(k))
+
+	lo = base * base + 1
+	hi = lo * 2
+	while count_bouncy_below(hi, base) < k:
+		lo, hi = hi, hi * 2
+
+	# Find the least n with k bouncy numbers in [1, n], i. e. below n + 1.
+	while lo < hi:
+		mid = (lo + hi) // 2
+		if count_bouncy_below(mid + 1, base) < k:
+			lo = mid + 1
+		else:
+			hi = mid
+	return lo
+
+
+def _monotonuous_below(n, base):
+	"""Returns the count and the sum of the monotonuous numbers in [1, n)
+
+	This is a digit DP over the most significant digits of n: every
+	monotonuous number below n shares a (monotonuous) prefix with n, followed
+	by a lesser digit and an arbitrary monotonuous completion.
+	"""
+	assert isinstance(n, int)
+	assert isinstance(base, int) and base >= 2
+	count = total = 0
+	if n <= 1:
+		return count, total
+
+	nd = list(digits(n, base))
+	nd.reverse()
+
+	for length in range(1, len(nd)):
+		for d in range(1, base):
+			c, s = _completions(d, length - 1, True, True, base)
+			count += c
+			total += c * d * base**(length - 1) + s
+
+	inc = dec = True
+	prefix = 0
+	for i, ni in enumerate(nd):
+		r = len(nd) - i - 1
+		for d in range(i == 0, ni):
+			c, s = _completions(d, r,
+				inc and (i == 0 or d >= nd[i-1]),
+				dec and (i == 0 or d <= nd[i-1]),
+				base)
+			count += c
+			total += c * (prefix * base + d) * base**r + s
+
+		if i:
+			inc = inc and ni >= nd[i-1]
+			dec = dec and ni <= nd[i-1]
+			if not (inc or dec):
+				break
+		prefix = prefix * base + ni
+
+	return count, total
+
+
+def _completions(d, r, inc, dec, base):
+	count = total = 0
+	if inc:
+		c, s = _non_decreasing(r, d, base)
+		count += c
+		total += s
+	if dec:
+		c, s = _non_increasing(r, d, base)
+		count += c
+		total += s
+	if inc and dec:
+		count -= 1
+		total -= d * (base**r - 1) // (base - 1)
+	return count, total
+
+
+@functools.lru_cache(maxsize=None)
+def _non_decreasing(r, lo, base):
+	"""Count and sum of the non-decreasing r-digit strings with digits >= lo"""
+	if r <= 0:
+		return 1, 0
+	count = total = 0
+	for e in range(lo, base):
+		c, s = _non_decreasing(r - 1, e, base)
+		count += c
+		total += e * base**(r - 1) * c + s
+	return count, total
+
+
+@functools.lru_cache(maxsize=None)
+def _non_increasing(r, hi, base):
+	"""Count and sum of the non-increasing r-digit strings with digits <= hi"""
+	if r <= 0:
+		return 1, 0
+	count = total = 0
+	for e in range(hi + 1):
+		c, s = _non_increasing(r - 1, e, base)
+		count += c
+		total += e * base**(r - 1) * c + s
+	return count, total
+
+
 def main(args=None):
 	if args is None:
 		args = sys.argv[1:]
@@ -0,0 +1,77 @@
+#!/usr/bin/python3
+"""
+Decompose arrays of non-negative integers into their digits
+
+The digit loops of the per-integer helpers (e. g. repdigit.digits and
+bouncy.digits) are replaced by a few array operations here.
+"""
+__all__ = ('digit_matrix', 'digit_count')
+
+import numpy as np
+
+
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def digit_matrix(a, base=10):
+	"""Returns a digit matrix and the digit counts of the items of a
+
+	The matrix has one row per item with its digits, least significant digit
+	first and padded with zeros up to the digit count of the largest item. Items
+	that don't fit into int64 are decomposed with Python ints instead.
+	"""
+	assert isinstance(base, int) and base >= 2
+	a = _as_int_array(a)
+	if a.ndim != 1:
+		raise ValueError(
+			'Expected a one-dimensional array, got {:d} dimensions'.format(a.ndim))
+
+	if a.dtype == object:
+		return _digit_matrix_int(a.tolist(), base)
+
+	width = digit_count(int(a.max(initial=0)), base)
+	powers = base ** np.arange(width, dtype=np.int64)
+	lengths = 1 + np.count_nonzero(a[:, np.newaxis] >= powers[1:], axis=1)
+	return a[:, np.newaxis] // powers % base, lengths
+
+
+def _digit_matrix_int(a, base):
+	rows = list(map(list, map(_digits, a, (base,) * len(a))))
+	lengths = np.fromiter(map(len, rows), np.intp, len(rows))
+	m = np.zeros((len(rows), max(lengths.max(initial=0), 1)), np.int64)
+	for row, digits in zip(m, rows):
+		row[:len(digits)] = digits
+	return m, lengths
+
+
+def _as_int_array(a):
+	a = np.asarray(a)
+	if not a.size:
+		return a.astype(np.int64)
+	if a.dtype == object:
+		if not all(isinstance(x, int) for x in a.flat):
+			raise TypeError('Expected an array of integers')
+	elif a.dtype.kind not in 'iu':
+		raise TypeError('Expected an array of integers, got {}'.format(a.dtype))
+
+	if a.min() < 0:
+		raise ValueError('Expected non-negative integers, got {}'.format(a.min()))
+	if a.max() > INT64_MAX:
+		return a.astype(object)
+	return a.astype(np.int64, copy=False)
+
+
+def digit_count(n, base=10):
+	"""Returns the number of digits of the non-negative integer n"""
+	count = 1
+	while n >= base:
+		n //= base
+		count += 1
+	return count
+
+
+def _digits(n, base):
+	while n >= base:
+		n, d = divmod(n, base)
+		yield d
+	yield n
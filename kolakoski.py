@@ -1,11 +1,16 @@
 #!/usr/bin/python3 -O
 # https://codegolf.stackexchange.com/questions/8369
 # https://en.wikipedia.org/wiki/Kolakoski_sequence
-from operator import itemgetter
-from itertools import cycle, islice, starmap
+from operator import itemgetter, methodcaller
+from itertools import cycle, islice, repeat, starmap
 from collections import deque
 from collections.abc import Iterable
 
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
 
 def kolakoski_reference(n, k=2):
 	k, m, s = _kolakoski_get_params(k)
@@ -19,13 +24,49 @@ def kolakoski_reference(n, k=2):
 
 
 def kolakoski(n, k=2):
-	s = islice(kolakoski_gen(k), n)
+	if np is not None:
+		s = kolakoski_numpy(n, k)
+		assert s.tolist() == kolakoski_reference(n, k)
+		return s
+
+	s = islice(kolakoski_lazy(k), n)
 	if __debug__:
 		s = list(s)
 		assert s == kolakoski_reference(n, k)
 	return s
 
 
+def kolakoski_numpy(n, k=2):
+	"""Returns the first n items of the Kolakoski sequence as a NumPy array
+
+	Every round expands all run lengths known so far into runs of the
+	corresponding symbols with a single np.repeat(), so the number of rounds
+	grows logarithmically with n.
+	"""
+	k, m, s = _kolakoski_get_params(k)
+	symbols = np.array([x for x, in m])
+	dtype = np.min_scalar_type(symbols.max())
+	symbols = symbols.astype(dtype)
+	if symbols.max() == 1:
+		return np.ones(n, dtype)
+
+	out = np.empty(max(n, len(s)) + int(symbols.max()), dtype)
+	out[:len(s)] = s
+	length = len(s)
+	i = length - 1
+	while length < n:
+		runs = out[i:length]
+		r = min(int(np.searchsorted(
+				np.cumsum(runs, dtype=np.int64), n - length)) + 1,
+			len(runs))
+		chunk = np.repeat(symbols[np.arange(i, i + r) % k], runs[:r])
+		out[length:length + len(chunk)] = chunk
+		length += len(chunk)
+		i += r
+
+	return out[:n]
+
+
 def kolakoski_gen(k=2):
 	k, m, s = _kolakoski_get_params(k)
 
@@ -34,12 +75,89 @@ def kolakoski_gen(k=2):
 	yield from s
 
 	s = deque()
-	for i in cycle([i].__iadd__(range(i))):
+	for i in _cycle_from(i, k):
 		s += m[i] * xi
 		xi = s.popleft()
 		yield xi
 
 
+def kolakoski_lazy(k=2):
+	"""Yields the Kolakoski sequence with O(log n) memory for n items
+
+	The run lengths are read from a nested, lazily advanced instance of the
+	same generator instead of a buffer of the items produced so far. Each
+	nesting level lags behind the one above by a constant factor.
+	"""
+	k, m, s = _kolakoski_get_params(k)
+	if all(x == (1,) for x in m):
+		return repeat(1)
+	return _kolakoski_lazy_impl(k, m, s)
+
+
+def _kolakoski_lazy_impl(k, m, s):
+	yield from s
+	i = len(s) - 1
+	runs = islice(_kolakoski_lazy_impl(k, m, s), i, None)
+	for i, xi in zip(_cycle_from(i, k), runs):
+		yield from m[i] * xi
+
+
+_PACK_TABLE = bytes.maketrans(b'\1\2', b'01')
+
+
+def kolakoski_pack(n, out=None, chunk_size=1 << 15):
+	"""Packs the first n items of the Kolakoski sequence (k=2) into bits
+
+	Each byte holds 8 items, the first in the most significant bit, with 0 for
+	1 and 1 for 2; the last byte is padded with zeros. The bytes are written
+	to the binary file object out or returned if that is None.
+	"""
+	assert chunk_size % 8 == 0
+	if out is None:
+		import io
+		with io.BytesIO() as out:
+			kolakoski_pack(n, out, chunk_size)
+			return out.getvalue()
+
+	items = islice(kolakoski_lazy(), n)
+	while True:
+		chunk = bytes(islice(items, chunk_size))
+		if not chunk:
+			break
+		size = -(-len(chunk) // 8)
+		bits = chunk.translate(_PACK_TABLE).ljust(size * 8, b'0')
+		out.write(int(bits, 2).to_bytes(size, 'big'))
+
+
+def kolakoski_count(n, symbol=1, packed=None, chunk_size=1 << 16):
+	"""Counts the occurrences of symbol in the first n items (k=2)
+
+	Uses the output of kolakoski_pack() if packed isn't None.
+	"""
+	if symbol not in (1, 2):
+		raise ValueError('Symbol must be 1 or 2, not {!r}'.format(symbol))
+
+	if packed is None:
+		items = islice(kolakoski_lazy(), n)
+		return sum(map(
+			methodcaller('count', symbol),
+			iter(lambda: bytes(islice(items, chunk_size)), b'')))
+
+	if n > len(packed) * 8:
+		raise ValueError(
+			'Packed sequence is shorter than {:d} items'.format(n))
+	full, rest = divmod(n, 8)
+	twos = bin(int.from_bytes(packed[:full], 'big')).count('1')
+	if rest:
+		twos += bin(packed[full] >> (8 - rest)).count('1')
+	return twos if symbol == 2 else n - twos
+
+
+def _cycle_from(i, k):
+	i %= k
+	return cycle((*range(i, k), *range(i)))
+
+
 def _kolakoski_get_params(k):
 	if k == 2:
 		return 2, ((1,), (2,)), [1, 2, 2]
@@ -90,8 +208,15 @@ def main(*args):
 	if not args:
 		import sys
 		args = sys.argv[1:]
-		if not args:
-			args = sys.stdin
+
+	if args and args[0] in ('-p', '--pack'):
+		return _main_pack(*args[1:])
+	if args and args[0] in ('-c', '--count'):
+		return _main_count(*args[1:])
+
+	if not args:
+		import sys
+		args = sys.stdin
 
 	args = tuple(map(parse_arg, args))
 	if len(args) == 1:
@@ -102,5 +227,26 @@ def main(*args):
 			print('{:{}d}:'.format(len(s), len_width), *s)
 
 
+def _main_pack(path, n):
+	n = int(n)
+	if path == '-':
+		import sys
+		kolakoski_pack(n, sys.stdout.buffer)
+	else:
+		with open(path, 'wb') as out:
+			kolakoski_pack(n, out)
+
+
+def _main_count(n, symbol='1', path=None):
+	n = int(n)
+	symbol = int(symbol)
+	if path is None:
+		packed = None
+	else:
+		with open(path, 'rb') as f:
+			packed = f.read(-(-n // 8))
+	print(kolakoski_count(n, symbol, packed))
+
+
 if __name__ == '__main__':
 	main()
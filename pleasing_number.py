@@ -1,6 +1,7 @@
 #!/usr/bin/python3
 # See https://codegolf.stackexchange.com/questions/150936/is-it-a-pleasing-number
 import itertools
+import functools
 import collections.abc
 
 
@@ -36,16 +37,53 @@ def int2str( n, base, prefix_positive=False ):
 		prefix = '-'
 		n = -n
 
+	# Split off chunks of word-sized powers of the base and convert those with
+	# small ints only.
+	width, power = _chunk_params(base)
 	s = []
 	while n:
-		n, digit = divmod(n, base)
-		s.append(_digits[digit])
+		n, chunk = divmod(n, power)
+		for _ in range(width):
+			chunk, digit = divmod(chunk, base)
+			s.append(_digits[digit])
 
+	while s[-1] == '0':
+		s.pop()
 	s.append(prefix)
 	return ''.join(reversed(s))
 
 
+@functools.lru_cache(maxsize=None)
+def _chunk_params(base):
+	width = max(63 // base.bit_length(), 1)
+	return width, base**width
+
+
 def is_pleasing_number( n, base=10 ):
+	return _is_pleasing_key(*_pleasing_key(n, base))
+
+
+def is_pleasing_many( iterable, base=10 ):
+	"""Returns a list of is_pleasing_number(n, base) for every n in iterable
+
+	Repeated items are converted only once.
+	"""
+	keys = {}
+	results = []
+	for n in iterable:
+		key = keys.get(n)
+		if key is None:
+			key = keys[n] = _pleasing_key(n, base)
+		results.append(_is_pleasing_key(*key))
+	return results
+
+
+def _pleasing_key( n, base ):
+	"""Returns the summary of n that decides whether it is pleasing
+
+	That is the greatest digit before the final run of equal digits of n and
+	the length of that run.
+	"""
 	if isinstance(n, int):
 		ns = int2str(n, base)
 	else:
@@ -59,9 +97,38 @@ def is_pleasing_number( n, base=10 ):
 				.format(n))
 
 	prefix = ns.rstrip(ns[-1])
-	a = int(max(prefix), base)
-	b = len(ns) - len(prefix)
-	return a <= 1 or a == 1 << b or round(a ** (1 / b)) ** b == a
+	return int(max(prefix), base), len(ns) - len(prefix)
+
+
+@functools.lru_cache(maxsize=1 << 12)
+def _is_pleasing_key( a, b ):
+	return a <= 1 or a == 1 << b or is_perfect_power(a, b)
+
+
+def is_perfect_power( a, k ):
+	"""Tells whether the non-negative integer a is the k-th power of an integer"""
+	return iroot(a, k) ** k == a
+
+
+def iroot( a, k ):
+	"""Returns the integer k-th root of a, i. e. floor(a ** (1 / k))"""
+	if not (isinstance(a, int) and isinstance(k, int)):
+		raise TypeError('Expected integer arguments')
+	if a < 0 or k < 1:
+		raise ValueError(
+			'Expected a >= 0 and k >= 1, got {:d} and {:d}'.format(a, k))
+	if a < 2 or k == 1:
+		return a
+	if k >= a.bit_length():
+		return 1
+
+	# Newton's iteration from above decreases monotonically to the root.
+	x = 1 << -(-a.bit_length() // k)
+	while True:
+		y = ((k - 1) * x + a // x**(k - 1)) // k
+		if y >= x:
+			return x
+		x = y
 
 
 def _is_pleasing_number_golfed1(n):p=n.rstrip(n[-1]);a=int(max(p));b=len(n)-len(p);return round(a**(1/b))**b==a
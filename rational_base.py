@@ -5,7 +5,9 @@ Represent numbers using rational bases
 Source: https://codegolf.stackexchange.com/q/157224
 """
 
+import math
 import string
+import functools
 from numbers import Rational
 from collections.abc import Sequence, ByteString
 
@@ -66,9 +68,7 @@ def _get_digit_type(digits):
 
 
 
-def int2str(n, base=Fraction(10), sign_prefixes=strtuple(('-', '')),
-	digits=digits['alphanum-upper']
-):
+def _as_base(base, digits):
 	if base is None:
 		if digits is not None:
 			base = len(digits)
@@ -79,10 +79,15 @@ def int2str(n, base=Fraction(10), sign_prefixes=strtuple(('-', '')),
 			"'base' must be a Rational type, not {0.__module__}.{0.__qualname__}"
 				.format(type(base)))
 	_verify_base(base, digits)
+	return Fraction(base)
 
+
+def int2str(n, base=Fraction(10), sign_prefixes=strtuple(('-', '')),
+	digits=digits['alphanum-upper']
+):
+	base = _as_base(base, digits)
 	n = int(n)
-	base = Fraction(base)
-	s = list(map(base.numerator.__rmod__, frange(base.explode, n, 0, True)))
+	s = _int_digits(n, base.numerator, base.denominator)
 	s.reverse()
 
 	if digits is None:
@@ -91,6 +96,258 @@ def int2str(n, base=Fraction(10), sign_prefixes=strtuple(('-', '')),
 		_get_digit_type(digits)().join(map(digits.__getitem__, map(abs, s))))
 
 
+def iter_range(start, stop, base=Fraction(10), digits=digits['alphanum-upper'],
+	sign_prefixes=strtuple(('-', ''))
+):
+	"""Yields int2str(n, base, sign_prefixes, digits) for n in range(start, stop)
+
+	The digits are kept in a buffer and incremented in place: adding 1 to
+	digit i that overflows p carries q to digit i + 1, which touches only a
+	few of the lowest digits on average.
+	"""
+	base = _as_base(base, digits)
+	p, q = base.numerator, base.denominator
+	start = int(start)
+	stop = int(stop)
+	if p <= 0 or start < 0:
+		yield from (int2str(n, base, sign_prefixes, digits)
+			for n in range(start, stop))
+		return
+	if stop <= start:
+		return
+
+	s = _int_digits(start, p, q)
+	if digits is not None:
+		join = _get_digit_type(digits)().join
+		prefix = sign_prefixes[True]
+		get_digit = digits.__getitem__
+
+	for _ in range(start, stop):
+		if digits is None:
+			yield s[::-1]
+		else:
+			yield prefix + join(map(get_digit, reversed(s)))
+
+		i = 0
+		carry = 1
+		while carry:
+			if i == len(s):
+				s.append(0)
+			carry, s[i] = divmod(s[i] + carry, p)
+			carry *= q
+			i += 1
+
+
+def str2int(s, base=Fraction(10), digits=digits['alphanum-upper'],
+	sign_prefixes=strtuple(('-', ''))
+):
+	"""The inverse of int2str()
+
+	Raises ValueError if s isn't a representation that int2str() produces.
+	"""
+	base = _as_base(base, digits)
+	if digits is None:
+		return _str2int_values(s, base.numerator, base.denominator, None)
+	return _str2int_impl(s, base, digits, sign_prefixes,
+		_digit_tables(_hashable_digits(digits)))
+
+
+def str2int_many(iterable, base=Fraction(10), digits=digits['alphanum-upper'],
+	sign_prefixes=strtuple(('-', ''))
+):
+	"""Returns a list of str2int() of every item of iterable
+
+	All items share the same translation tables.
+	"""
+	base = _as_base(base, digits)
+	if digits is None:
+		return [_str2int_values(s, base.numerator, base.denominator, None)
+			for s in iterable]
+	tables = _digit_tables(_hashable_digits(digits))
+	return [_str2int_impl(s, base, digits, sign_prefixes, tables)
+		for s in iterable]
+
+
+def _str2int_impl(s, base, digits, sign_prefixes, tables):
+	negative = sign_prefixes[0]
+	if negative and s.startswith(negative):
+		s = s[len(negative):]
+		positive = False
+	else:
+		if sign_prefixes[1] and s.startswith(sign_prefixes[1]):
+			s = s[len(sign_prefixes[1]):]
+		positive = True
+	if not s:
+		raise ValueError('Empty representation')
+
+	translate, delete_digits = tables
+	if delete_digits(s):
+		raise ValueError('Invalid digits in {!r}'.format(s))
+	return _str2int_values(
+		translate(s), base.numerator, base.denominator, positive)
+
+
+def _str2int_values(values, p, q, positive):
+	# Undo x_{i+1} = x_i // p * q from the most significant digit down:
+	# x_i = x_{i+1} / q * p + d_i, where x_{i+1} must be a multiple of q.
+	sign = -1 if p < 0 and positive is not None else 1
+	n = 0
+	first = True
+	for d in values:
+		d *= sign
+		if first:
+			first = False
+		elif not n:
+			raise ValueError('Leading zero digit')
+		a, r = divmod(n, q)
+		if r or not (0 <= d < p or p < d <= 0):
+			raise ValueError('Not a base {}/{} representation'.format(p, q))
+		n = a * p + d
+	if first:
+		raise ValueError('Empty representation')
+	if positive is not None and (n >= 0) != positive:
+		raise ValueError('Sign prefix contradicts the value {:d}'.format(n))
+	return n
+
+
+def _hashable_digits(digits):
+	return digits if isinstance(digits, (str, bytes)) else tuple(digits)
+
+
+@functools.lru_cache(maxsize=16)
+def _digit_tables(digits):
+	"""Returns functions to translate and to strip the digits of a string
+
+	The first maps the digits of a string to their values, the second deletes
+	all valid digits from a string.
+	"""
+	if isinstance(digits, bytes):
+		table = bytes.maketrans(digits, bytes(range(len(digits))))
+		return (lambda s: s.translate(table),
+			lambda s: s.translate(None, digits))
+
+	if not all(isinstance(c, str) and len(c) == 1 for c in digits):
+		raise ValueError('Digits must be single characters: {!r}'.format(digits))
+	table = str.maketrans({ c: chr(v) for v, c in enumerate(digits) })
+	delete_table = dict.fromkeys(map(ord, digits))
+	return (lambda s: map(ord, s.translate(table)),
+		lambda s: s.translate(delete_table))
+
+
+def _int_digits_reference(n, p, q):
+	base = Fraction(p, q)
+	return list(map(p.__rmod__, frange(base.explode, n, 0, True)))
+
+
+def _int_digits(n, p, q):
+	"""Returns the digits of n in base p/q, least significant first
+
+	Digit i is x_i mod p where x_0 = n and x_{i+1} = x_i // p * q, until the
+	first x_i that is zero.
+	"""
+	if p <= 0 or n < 0:
+		digits = []
+		x = n
+		while True:
+			x, d = divmod(x, p)
+			digits.append(d)
+			x *= q
+			if not x:
+				return digits
+
+	# x_i < n * (q/p)**i, so this is an upper bound of the digit count.
+	k = int(n.bit_length() / math.log2(p / q)) + 2
+	digits = _steps(n, k, p, q, {})[0]
+	while len(digits) > 1 and not digits[-1]:
+		digits.pop()
+	return digits
+
+
+# Step counts above this are split in halves by _steps().
+_DIVIDE_AND_CONQUER_STEPS = 1 << 11
+
+
+def _steps(x, k, p, q, powers):
+	"""Returns the first k digits of x in base p/q and x_k
+
+	With x = A * p**j + r and 0 <= r < p**j the first j digits of x equal
+	those of r and x_j = A * q**j + r_j, so the steps are split in halves
+	for large k.
+	"""
+	if k <= _DIVIDE_AND_CONQUER_STEPS:
+		return _steps_chunked(x, k, p, q)
+
+	j = k // 2
+	pj, qj = _powers(p, q, j, powers)
+	a, r = divmod(x, pj)
+	low, y = _steps(r, j, p, q, powers)
+	high, z = _steps(a * qj + y, k - j, p, q, powers)
+	low += high
+	return low, z
+
+
+def _powers(p, q, j, powers):
+	pq = powers.get(j)
+	if pq is None:
+		pq = powers[j] = (p**j, q**j)
+	return pq
+
+
+def _steps_chunked(x, k, p, q):
+	"""Like _steps() but does c steps at a time with word-sized p**c"""
+	c = max(60 // p.bit_length(), 1)
+	pc = p**c
+	qc = q**c
+	digits = []
+	for _ in range(k // c):
+		if not x:
+			break
+		a, r = divmod(x, pc)
+		for _ in range(c):
+			r, d = divmod(r, p)
+			digits.append(d)
+			r *= q
+		x = a * qc + r
+
+	for _ in range(k - len(digits)):
+		x, d = divmod(x, p)
+		digits.append(d)
+		x *= q
+	return digits, x
+
+
+def benchmark(sizes=(10, 10**2, 10**3, 10**4, 10**5), base=Fraction(3, 2),
+	reference_limit=10**4, file=None
+):
+	"""Times _int_digits() against the Fraction-based reference
+
+	Numbers have the given count of decimal digits; the reference is skipped
+	above reference_limit digits.
+	"""
+	import time, random
+	if file is None:
+		import sys
+		file = sys.stdout
+
+	print('{:>8s} {:>12s} {:>12s}'.format('digits', 'reference', 'int_digits'),
+		file=file)
+	for size in sizes:
+		n = random.randrange(10**(size - 1), 10**size)
+		t = time.perf_counter()
+		s = _int_digits(n, base.numerator, base.denominator)
+		t_digits = time.perf_counter() - t
+
+		if size <= reference_limit:
+			t = time.perf_counter()
+			assert s == _int_digits_reference(n, base.numerator, base.denominator)
+			t_reference = time.perf_counter() - t
+		else:
+			t_reference = math.nan
+
+		print('{:8d} {:12.6f} {:12.6f}'.format(size, t_reference, t_digits),
+			file=file)
+
+
 def _parse_sign_prefixes(s):
 	if not s or len(s) > 2:
 		raise ValueError('String is empty or longer than two')
@@ -105,8 +362,10 @@ def _make_argparser():
 		formatter_class=argparse.ArgumentDefaultsHelpFormatter,
 		**dict(zip(('description', 'epilog'),
 			map(str.strip, __doc__.rsplit('\n\n', 1)))))
-	p.add_argument('numbers', metavar='N[:Z]', nargs='+',
+	p.add_argument('numbers', metavar='N[:Z]', nargs='*',
 		help='Numbers and (optional) bases')
+	p.add_argument('-r', '--range', metavar='A:B', type=_parse_range,
+		help='Represent every number in [A, B) in the default base')
 	p.add_argument('-b', '--base', metavar='Z',
 		default=pp['base'].default,
 		help='The default target base')
@@ -126,8 +385,18 @@ def _make_argparser():
 	return p
 
 
+def _parse_range(s):
+	start, sep, stop = s.partition(':')
+	if not sep:
+		raise ValueError('Expected a range A:B, got ' + repr(s))
+	return int(start), int(stop)
+
+
 def _parse_args(args=None):
-	args = _make_argparser().parse_args(args)
+	p = _make_argparser()
+	args = p.parse_args(args)
+	if not (args.numbers or args.range):
+		p.error('Expected at least one number or a range')
 
 	if args.digits_preset:
 		args.digits = digits[args.digits_preset]
@@ -148,15 +417,31 @@ def _parse_args(args=None):
 
 def main(args=None):
 	args = _parse_args(args)
+	if args.range:
+		_write_range(*args.range, args)
 	for n in args.numbers:
 		n, sep, base = n.partition(':')
 		n = int(n)
 		base = Fraction(base) if sep else args.base
-		s = int2str(n, base, args.sign_prefixes, args.digits)
-		if not isinstance(s, str):
-			s = '{' + ', '.join(map(str, s)) + '}'
+		s = _format_digits(int2str(n, base, args.sign_prefixes, args.digits))
 		print('{0:d} = {2:s} (base {1!s})'.format(n, base, s))
 
 
+def _write_range(start, stop, args, chunk_size=1 << 12):
+	import sys, itertools
+	lines = map('{0:d} = {2:s} (base {1!s})\n'.format,
+		range(start, stop), itertools.repeat(str(args.base)),
+		map(_format_digits,
+			iter_range(start, stop, args.base, args.digits, args.sign_prefixes)))
+	for chunk in iter(lambda: ''.join(itertools.islice(lines, chunk_size)), ''):
+		sys.stdout.write(chunk)
+
+
+def _format_digits(s):
+	if not isinstance(s, str):
+		s = '{' + ', '.join(map(str, s)) + '}'
+	return s
+
+
 if __name__ == '__main__':
 	main()
@@ -3,11 +3,82 @@
 import operator
 import itertools
 
+try:
+	import numpy as np
+	from digit_matrix import digit_matrix
+except ImportError:
+	np = None
+
+
+DEFAULT_BASES = range(2, 37)
+
 
 def is_repdigit(n, base=10):
+	if not isinstance(n, int):
+		raise TypeError
+	if n < 0:
+		raise ValueError
+	return _is_repdigit_unchecked(n, base)
+
+
+def _is_repdigit_unchecked(n, base):
+	# n has k digits and is a multiple of the repunit (base**k - 1) / (base - 1).
+	repunit = 1
+	power = base
+	while power <= n:
+		repunit += power
+		power *= base
+	return not n % repunit
+
+
+def is_repdigit_many(a, base=10):
+	"""Returns a boolean array telling which items of a are repdigits"""
+	m, lengths = digit_matrix(a, base)
+	padding = np.arange(m.shape[1]) >= lengths[:, np.newaxis]
+	return np.all((m == m[:, :1]) | padding, axis=1)
+
+
+def _is_repdigit_reference(n, base=10):
 	return all(map_pairs(operator.eq, digits(n, base)))
 
 
+def repdigit_bases(n, bases=DEFAULT_BASES):
+	"""Returns a tuple of every base in bases in which n is a repdigit"""
+	if not isinstance(n, int):
+		raise TypeError
+	if n < 0:
+		raise ValueError
+	return tuple(b for b in bases
+		if b > n or (b * b > n and not n % (b + 1)) or
+			_is_repdigit_unchecked(n, b))
+
+
+def repdigits(base=10, limit=None):
+	"""Yields the repdigits d * (base**k - 1) / (base - 1) in ascending order
+
+	Stops before limit unless that is None.
+	"""
+	yield from itertools.takewhile(
+		(lambda n: True) if limit is None else limit.__gt__,
+		itertools.chain((0,), _repdigits_impl(base)))
+
+
+def _repdigits_impl(base):
+	repunit = 1
+	while True:
+		yield from range(repunit, repunit * base, repunit)
+		repunit = repunit * base + 1
+
+
+def repdigit_index(limit, bases=DEFAULT_BASES):
+	"""Maps every n < limit that is a repdigit in some base to those bases"""
+	index = {}
+	for b in bases:
+		for n in repdigits(b, limit):
+			index.setdefault(n, []).append(b)
+	return { n: tuple(b) for n, b in index.items() }
+
+
 is_repdigit_golfed1 = lambda n:len(set(str(n)))<2
 
 
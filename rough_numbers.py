@@ -1,9 +1,28 @@
 #!/usr/bin/python3
 # https://codegolf.stackexchange.com/q/175158
+import sys
+import array
+import bisect
 import itertools
+import functools
+from math import isqrt
 
 
-def rough_numbers(b, k=None):
+def rough_numbers(b, k=None, segment_size=1 << 16):
+	assert isinstance(b, int) and b >= 1
+
+	if b <= 2:
+		r = itertools.count(1, b)
+	else:
+		r = itertools.chain((1,), _rough_numbers_sieve(b, segment_size))
+
+	if k is not None:
+		r = itertools.islice(r, k)
+
+	return r
+
+
+def rough_numbers_reference(b, k=None):
 	assert isinstance(b, int) and b >= 1
 
 	if b <= 2:
@@ -17,3 +36,252 @@ def rough_numbers(b, k=None):
 		r = itertools.islice(r, k)
 
 	return r
+
+
+def _rough_numbers_sieve(b, segment_size, start=None):
+	"""Yields the b-rough numbers greater than b and at least start
+
+	Multiples of the primes up to b are struck from consecutive segments of
+	segment_size numbers.
+	"""
+	primes = primes_up_to(b)
+	segment_size = max(segment_size, b)
+	ones = b'\1' * segment_size
+
+	for lo in itertools.count(max(b + 1, start or 0), segment_size):
+		segment = bytearray(ones)
+		for p in primes:
+			offset = -lo % p
+			segment[offset::p] = bytes(len(range(offset, segment_size, p)))
+		yield from itertools.compress(range(lo, lo + segment_size), segment)
+
+
+def primes_up_to(n):
+	"""Returns a list of all primes p <= n"""
+	if n < 2:
+		return []
+	sieve = bytearray(b'\1') * (n + 1)
+	sieve[:2] = b'\0\0'
+	for p in range(2, int(n**0.5) + 1):
+		if sieve[p]:
+			sieve[p*p::p] = bytes(len(range(p*p, n + 1, p)))
+	return list(itertools.compress(range(n + 1), sieve))
+
+
+def count_rough(x, b):
+	"""Returns the number of b-rough numbers n <= x
+
+	This is Legendre's phi(x, a) where a is the number of primes up to b.
+	Intermediate values are memoised across calls in _phi_memo.
+	"""
+	assert isinstance(b, int) and b >= 1
+	if x < 1:
+		return 0
+	primes = _cached_primes_up_to(max(b, isqrt(x), _PRIME_COUNT_LIMIT))
+	if len(_phi_memo) > PHI_MEMO_SIZE:
+		_phi_memo.clear()
+	return _phi(x, bisect.bisect_right(primes, b), primes, _phi_memo)
+
+
+def nth_rough(k, b):
+	"""Returns the k-th b-rough number, counting from 1"""
+	assert isinstance(k, int)
+	if k <= 0:
+		raise ValueError('Expected a positive index, got {:d}'.format(k))
+
+	if k == 1 or b <= 2:
+		return (k - 1) * b + 1
+
+	# Step towards x with count_rough(x) < k using the density of the b-rough
+	# numbers until the remaining items fit into a few sieve segments.
+	density = functools.reduce(
+		lambda d, p: d * (1 - 1 / p), primes_up_to(b), 1.0)
+	x = max(int(k / density), b)
+	while True:
+		c = count_rough(x, b)
+		if c >= k:
+			x = max(x - int((c - k + 1) / density * 1.01) - 1, b)
+		elif (k - c) / density > _NTH_ROUGH_SIEVE_SPAN:
+			x += int((k - c) / density * 0.99)
+		else:
+			break
+	return next(itertools.islice(
+		_rough_numbers_sieve(b, 1 << 16, x + 1), k - c - 1, None))
+
+
+# nth_rough() sieves up to this many numbers past its last count.
+_NTH_ROUGH_SIEVE_SPAN = 1 << 18
+
+
+# Residue tables are only built if the primorial of b stays below this limit.
+MAX_PRIMORIAL = 1 << 24
+
+
+def rough_at(index, b):
+	"""Returns the b-rough number with the given index, counting from 0
+
+	For b with a primorial P up to MAX_PRIMORIAL this uses the period of the
+	sequence: item i is (i // phi(P)) * P + r[i % phi(P)] where r are the
+	residues modulo P coprime to it.
+	"""
+	assert isinstance(index, int) and index >= 0
+	table = _residue_table(b)
+	if table is None:
+		return nth_rough(index + 1, b)
+	primorial, residues = table
+	q, r = divmod(index, len(residues))
+	return q * primorial + residues[r]
+
+
+def rough_slice(b, start=0, stop=None, step=1):
+	"""Like itertools.islice(rough_numbers(b), start, stop, step)
+
+	Unlike islice() this doesn't iterate over the items before start.
+	"""
+	assert isinstance(start, int) and start >= 0
+	assert stop is None or isinstance(stop, int) and stop >= 0
+	assert isinstance(step, int) and step >= 1
+
+	table = _residue_table(b)
+	if table is not None:
+		if stop is None:
+			indices = itertools.count(start, step)
+		else:
+			indices = range(start, stop, step)
+		return _rough_slice_table(indices, *table)
+
+	if stop is not None and stop <= start:
+		return iter(())
+	first = rough_at(start, b)
+	r = _rough_numbers_sieve(b, 1 << 16, first)
+	if first == 1:
+		r = itertools.chain((1,), r)
+	return itertools.islice(r,
+		0, None if stop is None else stop - start, step)
+
+
+def _rough_slice_table(indices, primorial, residues):
+	period = len(residues)
+	for i in indices:
+		q, r = divmod(i, period)
+		yield q * primorial + residues[r]
+
+
+@functools.lru_cache(maxsize=8)
+def _residue_table(b):
+	primes = primes_up_to(b)
+	primorial = 1
+	for p in primes:
+		primorial *= p
+		if primorial > MAX_PRIMORIAL:
+			return None
+	coprime = bytearray(b'\1') * primorial
+	for p in primes:
+		coprime[::p] = bytes(len(range(0, primorial, p)))
+	return primorial, array.array('L',
+		itertools.compress(range(1, primorial + 1), coprime[1:] + coprime[:1]))
+
+
+# Prime counts up to this limit are looked up in a sieved list.
+_PRIME_COUNT_LIMIT = 1 << 16
+# phi(x, a) for the first _PRIMORIAL_PRIMES primes uses a residue table
+# modulo their primorial.
+_PRIMORIAL_PRIMES = 6
+# The memo of phi(x, a) shared by all calls to count_rough() is cleared once
+# it holds more than this many entries.
+PHI_MEMO_SIZE = 1 << 20
+_phi_memo = {}
+
+
+def _phi(x, a, primes, memo):
+	if not x:
+		return 0
+	if a <= _PRIMORIAL_PRIMES:
+		primorial, counts = _primorial_table(a)
+		q, r = divmod(x, primorial)
+		return q * counts[-1] + counts[r]
+	if x <= primes[a-1]:
+		return 1
+	if x <= primes[-1] and a < len(primes) and x < primes[a]**2:
+		# Only 1 and the primes greater than p_a remain.
+		return bisect.bisect_right(primes, x) - a + 1
+
+	key = (x, a)
+	result = memo.get(key)
+	if result is None:
+		# phi(x, a) = phi(x, a - 1) - phi(x // p_a, a - 1), unrolled down to
+		# the residue table so the recursion depth stays logarithmic in x.
+		# For p_i > sqrt(x) the subtrahend phi(x // p_i, i - 1) is always 1.
+		c = _PRIMORIAL_PRIMES
+		end = min(a, bisect.bisect_right(primes, x))
+		mid = max(min(end, bisect.bisect_right(primes, isqrt(x))), c)
+		result = _phi(x, c, primes, memo) - max(end - mid, 0)
+		for i in range(c, mid):
+			result -= _phi(x // primes[i], i, primes, memo)
+		memo[key] = result
+	return result
+
+
+@functools.lru_cache(maxsize=None)
+def _primorial_table(a):
+	"""Returns the primorial of the first a primes and its coprime counts
+
+	The table holds the number of integers in [1, r] coprime to the primorial
+	for each residue r.
+	"""
+	primes = primes_up_to(13)[:a]
+	primorial = functools.reduce(int.__mul__, primes, 1)
+	coprime = bytearray(b'\1') * primorial
+	for p in primes:
+		coprime[::p] = bytes(len(range(0, primorial, p)))
+	counts = list(itertools.accumulate(coprime[1:], initial=0))
+	if a == 0:
+		counts = [0, 1]
+	return primorial, counts
+
+
+@functools.lru_cache(maxsize=4)
+def _cached_primes_up_to(n):
+	return primes_up_to(n)
+
+
+def benchmark(cases=((3, 10**3), (7, 10**4), (30, 10**4), (1000, 10**4)),
+	number=3, file=None
+):
+	"""Times count_rough() and nth_rough() against the generator"""
+	import timeit
+	if file is None:
+		file = sys.stdout
+
+	print('{:>6s} {:>8s} {:>12s} {:>12s} {:>12s}'.format(
+			'b', 'k', 'generator', 'count_rough', 'nth_rough'),
+		file=file)
+	for b, k in cases:
+		x = nth_rough(k, b)
+		assert x == next(itertools.islice(rough_numbers(b), k - 1, None))
+		assert count_rough(x, b) == k
+		print('{:6d} {:8d} {:12.6f} {:12.6f} {:12.6f}'.format(b, k,
+				*(min(timeit.repeat(f, number=1, repeat=number)) for f in (
+					lambda: next(itertools.islice(rough_numbers(b), k - 1, None)),
+					lambda: (_phi_memo.clear(), count_rough(x, b)),
+					lambda: (_phi_memo.clear(), nth_rough(k, b))))),
+			file=file)
+
+
+def main(args=None):
+	if args is None:
+		args = sys.argv[1:]
+
+	if args and args[0] == '--benchmark':
+		benchmark()
+	elif args and args[0] == '--count':
+		print(count_rough(int(args[1]), int(args[2])))
+	elif args and args[0] == '--nth':
+		print(nth_rough(int(args[1]), int(args[2])))
+	else:
+		b, k = map(int, args)
+		print(*rough_numbers(b, k))
+
+
+if __name__ == '__main__':
+	main()
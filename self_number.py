@@ -1,5 +1,6 @@
 #!/usr/bin/python3
 # https://codegolf.stackexchange.com/q/159881
+import itertools
 
 
 def is_self_number(x):
@@ -9,19 +10,137 @@ def is_self_number(x):
 		else:
 			raise ValueError('Expected a positive number, got ' + str(x))
 
-	counter_examples = tuple(filter(x.__eq__,
-		map(_counter_example_candidate, range(1, x))))
+	counter_examples = _counter_examples(x, _counter_example_window(x))
 	return (not counter_examples, counter_examples)
 
 
+def is_self_number_reference(x):
+	if x <= 0:
+		if x == 0:
+			return (False, (0,))
+		else:
+			raise ValueError('Expected a positive number, got ' + str(x))
+
+	counter_examples = _counter_examples(x, range(1, x))
+	return (not counter_examples, counter_examples)
+
+
+def check_self_number(limit, func=is_self_number):
+	"""Yields every 0 <= x < limit where func(x) disagrees with the reference"""
+	return (x for x in range(limit)
+		if func(x) != is_self_number_reference(x))
+
+
 def _counter_example_candidate(n):
 	return n + sum(map(int, str(n)))
 
 
+def self_numbers(limit):
+	"""Returns a bytearray that marks the self numbers below limit
+
+	Item x is non-zero iff x is a self number, for all 0 <= x < limit.
+	"""
+	if limit < 0:
+		raise ValueError('Expected a non-negative limit, got ' + str(limit))
+
+	sieve = bytearray(b'\1') * limit
+	# The ten numbers 10*h + d with 0 <= d < 10 generate the targets
+	# 10*h + digitsum(h) + 2*d, i. e. every other item of a slice of length 19.
+	for h, s in enumerate(_digit_sums(-(-limit // 10))):
+		start = 10 * h + s
+		if start >= limit:
+			continue
+		stop = min(start + 19, limit)
+		sieve[start:stop:2] = bytes(len(range(start, stop, 2)))
+
+	return sieve
+
+
+def _digit_sums(limit):
+	ds = bytearray(range(min(limit, 10)))
+	for h in range(1, -(-limit // 10)):
+		s = ds[h]
+		ds += bytes(range(s, s + 10))
+	del ds[limit:]
+	return ds
+
+
+def iter_self_numbers(start=1, stop=None, segment_size=10**6):
+	"""Yields the self numbers in [start, stop) in ascending order
+
+	The sieve is processed in segments of segment_size numbers. Only the
+	targets spilling past the end of a segment are carried into the next one,
+	so memory use doesn't depend on start or stop.
+	"""
+	if start < 0:
+		raise ValueError('Expected a non-negative start, got ' + str(start))
+	if segment_size <= 0:
+		raise ValueError(
+			'Expected a positive segment size, got ' + str(segment_size))
+
+	segment_size = -(-segment_size // 10) * 10
+	low_size = 10**4
+	low_digit_sums = _digit_sums(low_size)
+	zeros = bytes(10)
+
+	lo = max(start - 9 * len(str(start)), 0) // 10 * 10
+	carry = bytearray()
+	high = high_digit_sum = None
+
+	while stop is None or lo < stop:
+		hi = lo + segment_size
+		sieve = carry
+		sieve += b'\1' * (segment_size + 9 * len(str(hi)) - len(sieve))
+
+		for h in range(lo // 10, hi // 10):
+			q, r = divmod(h, low_size)
+			if q != high:
+				high = q
+				high_digit_sum = sum(map(int, str(q)))
+			i = 10 * h + low_digit_sums[r] + high_digit_sum - lo
+			sieve[i:i+19:2] = zeros
+
+		carry = sieve[segment_size:]
+		first = min(max(start - lo, 0), segment_size)
+		last = segment_size if stop is None else min(stop - lo, segment_size)
+		yield from itertools.compress(
+			range(lo + first, lo + last), sieve[first:last])
+		lo = hi
+
+
+def is_self_number_many(iterable):
+	"""Returns a list of membership flags for every item of iterable"""
+	xs = tuple(map(int, iterable))
+	if not xs:
+		return []
+	if min(xs) < 0:
+		raise ValueError('Expected a positive number, got ' + str(min(xs)))
+
+	sieve = self_numbers(max(xs) + 1)
+	return list(map(bool, map(sieve.__getitem__, xs)))
+
+
+def _counter_examples(x, candidates):
+	return tuple(filter(x.__eq__, map(_counter_example_candidate, candidates)))
+
+
+def _counter_example_window(x):
+	# A generator n of x satisfies x - n = digitsum(n) <= 9 * len(str(n)).
+	return range(max(x - 9 * len(str(x)), 1), x)
+
+
 def is_self_number_golfed1(x):
 	return all(x^n+sum(map(int,str(n)))for n in range(x))
 
 
+def is_self_number_golfed2(x):
+	return all(x^n+sum(map(int,str(n)))for n in range(max(0,x-9*len(str(x))),x))
+
+
+SIEVE_MIN_INPUTS = 16
+SIEVE_MAX_LIMIT = 10**8
+
+
 def main(*args):
 	if args:
 		args = list(args)
@@ -29,6 +148,9 @@ def main(*args):
 		import sys
 		args = sys.argv[1:]
 
+	if args and args[0] == '--iter':
+		return _main_iter(*args[1:])
+
 	if args and args[0] == '--golfed':
 		del args[0]
 		if args and not args[0].startswith('-'):
@@ -44,11 +166,20 @@ def main(*args):
 
 	if len(args) == 1 and args[0] == '-':
 		import sys
-		args = filter(None, map(str.strip, sys.stdin))
+		args = tuple(map(int, filter(None, map(str.strip, sys.stdin))))
+		if (len(args) >= SIEVE_MIN_INPUTS and
+			0 <= min(args) and max(args) < SIEVE_MAX_LIMIT
+		):
+			results = map(_with_counter_examples,
+				args, is_self_number_many(args))
+		else:
+			results = map(is_self_number, args)
+	else:
+		args = tuple(map(int, args))
+		results = map(is_self_number, args)
 
 	total_success = True
-	for x in map(int, args):
-		b, counter_examples = is_self_number(x)
+	for x, (b, counter_examples) in zip(args, results):
 		print(
 			'{:d} ({})'.format(x, b),
 			*map(_format_counter_example, counter_examples),
@@ -80,6 +211,27 @@ def main(*args):
 			*src, sep='\n')
 
 
+def _main_iter(bounds, segment_size=None, chunk_size=1 << 12):
+	import sys
+
+	start, sep, stop = bounds.rpartition(':')
+	start = int(start) if start else 1
+	stop = int(stop) if stop else None
+	kwargs = {}
+	if segment_size is not None:
+		kwargs['segment_size'] = int(segment_size)
+
+	numbers = map(str, iter_self_numbers(start, stop, **kwargs))
+	write = sys.stdout.write
+	for chunk in iter(lambda: tuple(itertools.islice(numbers, chunk_size)), ()):
+		write('\n'.join(chunk))
+		write('\n')
+
+
+def _with_counter_examples(x, b):
+	return (b, ()) if b else is_self_number(x)
+
+
 def _format_counter_example(n):
 	n = str(n)
 	return n + ' + ' + ' + '.join(n)
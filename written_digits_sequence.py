@@ -1,14 +1,50 @@
 #!/usr/bin/python3
 # https://codegolf.stackexchange.com/q/174521
+import os
 import sys
+import mmap
+import array
+import struct
 import itertools
+import functools
 
 
-def sequence(n=None, digit_lengths=(4, 3, 3, 5, 4, 4, 3, 5, 5, 4)):
+DEFAULT_DIGIT_LENGTHS = (4, 3, 3, 5, 4, 4, 3, 5, 5, 4)
+
+
+def sequence(n=None, digit_lengths=DEFAULT_DIGIT_LENGTHS, checkpoints=None):
 	assert digit_lengths and all(
 		isinstance(x, int) and x > 0
 		for x in map(digit_lengths.__getitem__, range(10)))
 
+	digit_lengths = tuple(map(digit_lengths.__getitem__, range(10)))
+	if checkpoints is not None and checkpoints.digit_lengths != digit_lengths:
+		raise ValueError(
+			'Checkpoint digit lengths {!r} differ from {!r}'
+				.format(checkpoints.digit_lengths, digit_lengths))
+
+	if n is None:
+		return _sequence_impl(digit_lengths.__getitem__)
+
+	if isinstance(n, slice):
+		start = default_if_none(n.start, 0)
+		seq = _sequence_impl(digit_lengths.__getitem__,
+			_resume(start, digit_lengths, checkpoints))
+		return itertools.islice(seq,
+			0, None if n.stop is None else max(n.stop - start, 0),
+			default_if_none(n.step, 1))
+
+	return _resume(n, digit_lengths, checkpoints)
+
+
+def _resume(n, digit_lengths, checkpoints):
+	if checkpoints is None or not len(checkpoints):
+		return _advance(0, n, digit_lengths)
+	i = min(n // checkpoints.interval, len(checkpoints) - 1)
+	return _advance(checkpoints[i], n - i * checkpoints.interval, digit_lengths)
+
+
+def sequence_reference(n=None, digit_lengths=DEFAULT_DIGIT_LENGTHS):
 	seq = _sequence_impl(digit_lengths.__getitem__)
 
 	if n is not None:
@@ -21,13 +57,193 @@ def sequence(n=None, digit_lengths=(4, 3, 3, 5, 4, 4, 3, 5, 5, 4)):
 	return seq
 
 
-def _sequence_impl(digit_lengths):
-	a = 0
+def _sequence_impl(digit_lengths, a=0):
 	while True:
 		yield a
 		a += sum(map(digit_lengths, digits(a)))
 
 
+# The jump tables split the terms into a high part and zero-padded low blocks
+# of BLOCK_DIGITS digits. As long as a term stays within the same block its
+# high part contributes a constant letter sum.
+BLOCK_DIGITS = 3
+BLOCK_SIZE = 10**BLOCK_DIGITS
+MAX_LEVEL = 3
+
+
+def _advance(a, n, digit_lengths):
+	"""Returns the term n steps after a"""
+	assert isinstance(n, int) and n >= 0
+	letter_sum = digit_lengths.__getitem__
+
+	while n and a < BLOCK_SIZE:
+		a += sum(map(letter_sum, digits(a)))
+		n -= 1
+
+	while n:
+		level = min((len(str(a)) - 1) // BLOCK_DIGITS, MAX_LEVEL + 1) - 1
+		size = BLOCK_SIZE**(level + 1)
+		high, low = divmod(a, size)
+		low, n = _advance_in_block(level, low,
+			sum(map(letter_sum, digits(high))), n, digit_lengths)
+		a = high * size + low
+
+	return a
+
+
+def _advance_in_block(level, low, high_sum, n, digit_lengths):
+	"""Advances by at most n steps from low in a block of the given level
+
+	Stops when n steps are done or the term leaves the block. Returns the
+	low part of the new term (which exceeds the block size in the latter case)
+	and the remaining step count.
+	"""
+	steps, low_out = _jump(level, low, high_sum, digit_lengths)
+	if steps <= n:
+		return low_out, n - steps
+
+	if not level:
+		padded_sums = _padded_letter_sums(digit_lengths)
+		for n in range(n, 0, -1):
+			low += high_sum + padded_sums[low]
+		return low, 0
+
+	size = BLOCK_SIZE**level
+	padded_sums = _padded_letter_sums(digit_lengths)
+	middle, low = divmod(low, size)
+	while n:
+		low, n = _advance_in_block(level - 1, low,
+			high_sum + padded_sums[middle], n, digit_lengths)
+		carry, low = divmod(low, size)
+		middle += carry
+	return middle * size + low, 0
+
+
+@functools.lru_cache(maxsize=None)
+def _jump(level, low, high_sum, digit_lengths):
+	"""Returns the steps until a term leaves its block and its low part then"""
+	padded_sums = _padded_letter_sums(digit_lengths)
+	steps = 0
+
+	if not level:
+		while low < BLOCK_SIZE:
+			low += high_sum + padded_sums[low]
+			steps += 1
+		return steps, low
+
+	size = BLOCK_SIZE**level
+	middle, low = divmod(low, size)
+	while middle < BLOCK_SIZE:
+		s, low = _jump(level - 1, low, high_sum + padded_sums[middle],
+			digit_lengths)
+		steps += s
+		carry, low = divmod(low, size)
+		middle += carry
+	return steps, middle * size + low
+
+
+@functools.lru_cache(maxsize=None)
+def _padded_letter_sums(digit_lengths):
+	sums = [0]
+	for _ in range(BLOCK_DIGITS):
+		sums = [s + d for d in digit_lengths for s in sums]
+	return tuple(sums)
+
+
+class Checkpoints:
+	"""A memory-mapped file of every interval-th term of the sequence
+
+	The file starts with a header of HEADER_FORMAT (magic, version, interval
+	and digit lengths) followed by the terms as native unsigned 64-bit
+	integers. Item i is the term with the index i * interval.
+	"""
+
+	MAGIC = b'WDSQ'
+	VERSION = 1
+	HEADER_FORMAT = '=4sIQ10s6x'
+	DEFAULT_INTERVAL = 1 << 16
+
+
+	def __init__(self, path):
+		self.path = path
+		self._file = open(path, 'rb')
+		try:
+			header = self._file.read(struct.calcsize(self.HEADER_FORMAT))
+			magic, version, self.interval, digit_lengths = (
+				struct.unpack(self.HEADER_FORMAT, header))
+			if magic != self.MAGIC or version != self.VERSION:
+				raise ValueError('Not a checkpoint file: ' + str(path))
+			self.digit_lengths = tuple(digit_lengths)
+
+			size = os.fstat(self._file.fileno()).st_size
+			if size > len(header):
+				self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+				self._terms = memoryview(self._mmap)[len(header):].cast('Q')
+			else:
+				self._mmap = None
+				self._terms = ()
+		except BaseException:
+			self._file.close()
+			raise
+
+
+	@classmethod
+	def build(cls, path, stop, interval=DEFAULT_INTERVAL,
+		digit_lengths=DEFAULT_DIGIT_LENGTHS
+	):
+		"""Writes a new checkpoint file for the terms with indices below stop"""
+		digit_lengths = tuple(digit_lengths)
+		with open(path, 'wb') as f:
+			f.write(struct.pack(cls.HEADER_FORMAT,
+				cls.MAGIC, cls.VERSION, interval, bytes(digit_lengths)))
+		cls.extend(path, stop)
+		return cls(path)
+
+
+	@classmethod
+	def extend(cls, path, stop, chunk_size=1 << 12):
+		"""Appends checkpoints to an existing file up to the index stop"""
+		with cls(path) as checkpoints:
+			interval = checkpoints.interval
+			digit_lengths = checkpoints.digit_lengths
+			count = len(checkpoints)
+			a = checkpoints[-1] if count else None
+
+		with open(path, 'ab') as f:
+			while count * interval < stop:
+				terms = array.array('Q')
+				while count * interval < stop and len(terms) < chunk_size:
+					a = 0 if a is None else _advance(a, interval, digit_lengths)
+					terms.append(a)
+					count += 1
+				terms.tofile(f)
+
+
+	def close(self):
+		if self._mmap is not None:
+			self._terms.release()
+			self._mmap.close()
+			self._mmap = None
+		self._terms = ()
+		self._file.close()
+
+
+	def __enter__(self):
+		return self
+
+
+	def __exit__(self, *args):
+		self.close()
+
+
+	def __len__(self):
+		return len(self._terms)
+
+
+	def __getitem__(self, i):
+		return self._terms[i]
+
+
 def digits(n, base=10):
 	assert isinstance(n, int) and n >= 0
 	assert isinstance(base, int) and base >= 2
@@ -41,12 +257,54 @@ def default_if_none(x, default):
 	return x if x is not None else default
 
 
+def parse_args(args):
+	import argparse
+	ap = argparse.ArgumentParser()
+	ap.add_argument('count', metavar='N', type=int, nargs='?',
+		help='Print N terms')
+	ap.add_argument('-s', '--start', metavar='I', type=int, default=0,
+		help='Index of the first term to print')
+	ap.add_argument('-i', '--index', metavar='FILE',
+		help='Resume from the checkpoints in this file')
+
+	ap_build = ap.add_mutually_exclusive_group()
+	ap_build.add_argument('--build-index', metavar='STOP', type=int,
+		help='(Re-)create the checkpoint file up to the index STOP')
+	ap_build.add_argument('--extend-index', metavar='STOP', type=int,
+		help='Extend the checkpoint file up to the index STOP')
+	ap.add_argument('--interval', metavar='K', type=int,
+		default=Checkpoints.DEFAULT_INTERVAL,
+		help='Store every K-th term when building a checkpoint file')
+
+	args = ap.parse_args(args)
+	if (args.build_index is not None or args.extend_index is not None) and not args.index:
+		ap.error('Building or extending a checkpoint file requires --index')
+	if args.count is None and args.build_index is None and args.extend_index is None:
+		ap.error('Nothing to do')
+
+	return args
+
+
 def main(args=None):
 	if args is None:
 		args = sys.argv[1:]
+	args = parse_args(args)
+
+	if args.build_index is not None:
+		Checkpoints.build(args.index, args.build_index, args.interval).close()
+	elif args.extend_index is not None:
+		Checkpoints.extend(args.index, args.extend_index)
 
-	for a in sequence(slice(int(args[0]))):
-		print(a)
+	if args.count is not None:
+		checkpoints = Checkpoints(args.index) if args.index else None
+		try:
+			for a in sequence(slice(args.start, args.start + args.count),
+				checkpoints=checkpoints
+			):
+				print(a)
+		finally:
+			if checkpoints is not None:
+				checkpoints.close()
 
 
 if __name__ == '__main__':
@@ -1,32 +1,122 @@
 #!/usr/bin/python3 -O
 # https://codegolf.stackexchange.com/q/173601
-__all__ = ('encode', 'decode')
+__all__ = ('encode', 'decode', 'encode_many', 'decode_many',
+	'fibonacci_pack', 'fibonacci_unpack', 'iter_secret_fibonacci',
+	'secret_fibonacci_mask', 'term_counts')
 import sys
+import array
+import bisect
 import argparse
 import itertools
 
+try:
+	import numpy as np
+except ImportError:
+	np = None
+
 String = (str, bytes)
 
 
 def decode(bits):
 	if isinstance(bits, String):
 		bits = int(bits, 2)
-	return sum(map(logical_and, int_bits(bits), _fibonacci_series_impl(1, 2)))
+	validate_int(bits)
+	table = _fibonacci_table_len(bits.bit_length())
+	n = 0
+	while bits:
+		low = bits & -bits
+		n += table[low.bit_length() - 1]
+		bits ^= low
+	return n
+
+
+def decode_many(iterable):
+	"""Decodes every item of iterable and returns a list of the results"""
+	bits = [int(b, 2) if isinstance(b, String) else b for b in iterable]
+	if bits:
+		_fibonacci_table_len(max(bits).bit_length())
+	return list(map(decode, bits))
 
 
 def encode(n, *, reverse=True, output_type=str):
-	z = _encode_impl(n)
-	if reverse:
-		z = reversed(tuple(z))
+	terms = _encode_terms(n)
+	if reverse and output_type is not None:
+		z = sum(1 << i for i in terms)
+		if output_type is str:
+			return format(z, 'b')
+		return _check_output_type(z, output_type)
+
+	if terms:
+		table = _fibonacci_table(n)
+		z = [0] * (terms[0] + 1)
+		for i in terms:
+			z[i] = table[i]
+		if not reverse:
+			z.reverse()
+	else:
+		z = [0]
+
 	if output_type is not None:
 		z = sum(map(int.__lshift__, map(bool, z), itertools.count()))
 		if output_type is str:
 			z = format(z, 'b')
-		elif output_type is not int:
-			raise ValueError('Invalid output type: {!r}'.format(output_type))
+		else:
+			z = _check_output_type(z, output_type)
 	return z
 
 
+def _check_output_type(z, output_type):
+	if output_type is not int:
+		raise ValueError('Invalid output type: {!r}'.format(output_type))
+	return z
+
+
+def encode_many(iterable, *, reverse=True, output_type=str):
+	"""Encodes every item of iterable and returns a list of the results"""
+	numbers = tuple(iterable)
+	if numbers:
+		_fibonacci_table(max(numbers))
+	return [encode(n, reverse=reverse, output_type=output_type)
+		for n in numbers]
+
+
+def _encode_terms(n):
+	"""Returns the indices of the Zeckendorf terms of n in descending order
+
+	Index i refers to the Fibonacci number _fibonacci_terms[i], i. e. 1, 2, 3,
+	5, etc.
+	"""
+	validate_int(n)
+	table = _fibonacci_table(n)
+	indices = []
+	hi = len(table)
+	while n:
+		hi = bisect.bisect_right(table, n, 0, hi) - 1
+		indices.append(hi)
+		n -= table[hi]
+	return indices
+
+
+def _fibonacci_table(n):
+	"""Returns a table of Fibonacci terms whose last item is greater than n"""
+	if n < _fibonacci_terms_small[-1]:
+		return _fibonacci_terms_small
+	table = _fibonacci_terms
+	while table[-1] <= n:
+		table.append(table[-2] + table[-1])
+	return table
+
+
+def _fibonacci_table_len(length):
+	"""Returns a table of at least length Fibonacci terms"""
+	if length <= len(_fibonacci_terms_small):
+		return _fibonacci_terms_small
+	table = _fibonacci_terms
+	while len(table) < length:
+		table.append(table[-2] + table[-1])
+	return table
+
+
 def _encode_impl(n):
 	validate_int(n)
 	for fib in reversed(tuple(
@@ -68,11 +158,157 @@ def _fibonaci_series_from(n, count=None):
 	return fib
 
 
+# The distinct Fibonacci numbers starting at 1 as used by Zeckendorf
+# representations; the prefix that fits into 64 bits is kept in an array.
+_fibonacci_terms_small = array.array('Q', itertools.takewhile(
+	(1 << 64).__gt__, _fibonacci_series_impl(1, 2)))
+_fibonacci_terms = _fibonacci_terms_small.tolist()
+
+
 def is_secret_fibonacci(n):
 	z = frozenset(_encode_impl(n))
 	return len(z) in z
 
 
+# Since _encode_impl() yields a zero for the gap that follows every term but
+# the last, is_secret_fibonacci(n) holds iff n == 1 or n has t >= 2 terms and
+# t + 1 is one of them.
+
+def iter_secret_fibonacci(start=0, stop=None, block_size=1 << 16):
+	"""Yields the n in [start, stop) for which is_secret_fibonacci(n) holds"""
+	validate_int(start, 'start')
+	if np is None:
+		return itertools.compress(
+			itertools.count(start) if stop is None else range(start, stop),
+			_secret_fibonacci_scan(start, stop))
+	return _iter_secret_fibonacci_blocks(start, stop, block_size)
+
+
+def _iter_secret_fibonacci_blocks(start, stop, block_size):
+	for lo in itertools.count(start, block_size):
+		hi = lo + block_size if stop is None else min(lo + block_size, stop)
+		if hi <= lo:
+			break
+		# Add the offset in Python since lo may exceed the range of int64.
+		yield from [
+			lo + i for i in np.flatnonzero(secret_fibonacci_mask(lo, hi)).tolist()]
+
+
+def _secret_fibonacci_scan(start, stop):
+	"""Yields is_secret_fibonacci(n) for every n in [start, stop)
+
+	The Zeckendorf bits of n are kept in a list and incremented in place;
+	carries only ever touch a few of the lowest bits on average.
+	"""
+	table = _fibonacci_terms
+	index_of = { f: i for i, f in enumerate(table[:16]) }
+	bits = [0] * 2
+	for i in _encode_terms(start):
+		bits += [0] * (i + 3 - len(bits))
+		bits[i] = 1
+	count = sum(bits)
+
+	for n in itertools.count(start) if stop is None else range(start, stop):
+		if count < 2:
+			yield n == 1
+		else:
+			i = index_of.get(count + 1)
+			yield i is not None and i < len(bits) and bits[i] == 1
+
+		# Add F(2) = 1 and merge adjacent terms F(k) + F(k+1) = F(k+2).
+		if bits[0]:
+			bits[0] = 0
+			k = 1
+		elif bits[1]:
+			bits[1] = 0
+			k = 2
+		else:
+			bits[0] = 1
+			count += 1
+			continue
+		if len(bits) < k + 3:
+			bits += [0] * (k + 3 - len(bits))
+		while bits[k + 1]:
+			bits[k + 1] = 0
+			count -= 1
+			k += 2
+			if len(bits) < k + 3:
+				bits += [0] * (k + 3 - len(bits))
+		bits[k] = 1
+
+
+def secret_fibonacci_mask(start, stop):
+	"""Returns a boolean NumPy array of is_secret_fibonacci(n) for [start, stop)"""
+	counts, masks = _zeckendorf_range(start, stop)
+	index_of = np.full(max(int(counts.max(initial=0)) + 2, 4), -1, np.int8)
+	for i, f in enumerate(_fibonacci_terms):
+		if f >= len(index_of):
+			break
+		index_of[f] = i
+
+	i = index_of[counts.astype(np.intp) + 1]
+	has_term = (i >= 0) & ((masks >> np.maximum(i, 0).astype(np.uint32)) & 1 == 1)
+	secret = (counts >= 2) & has_term
+	if start <= 1 < stop:
+		secret[1 - start] = True
+	return secret
+
+
+def term_counts(start, stop):
+	"""Returns a NumPy array of the Zeckendorf term counts of [start, stop)"""
+	return _zeckendorf_range(start, stop)[0]
+
+
+_ZECKENDORF_PREFIX_LIMIT = 1 << 20
+_zeckendorf_prefix = None
+
+
+def _zeckendorf_range(start, stop):
+	"""Returns the term counts and low term bit masks of [start, stop)
+
+	Every n in [F, F') between consecutive Fibonacci terms is F plus the
+	representation of n - F, so each such segment is derived from a range
+	closer to zero. Ranges within the cached prefix are plain slices.
+	"""
+	validate_int(start, 'start')
+	stop = max(start, stop)
+	prefix_counts, prefix_masks = _get_zeckendorf_prefix()
+	if stop <= len(prefix_counts):
+		return prefix_counts[start:stop], prefix_masks[start:stop]
+
+	counts = np.empty(stop - start, np.uint8)
+	masks = np.empty(stop - start, np.uint32)
+	if start == 0:
+		counts[0] = masks[0] = 0
+	table = _fibonacci_table(stop)
+	k = max(bisect.bisect_right(table, start) - 1, 0)
+	while table[k] < stop:
+		lo = max(start, table[k])
+		hi = min(stop, table[k + 1])
+		c, m = _zeckendorf_range(lo - table[k], hi - table[k])
+		counts[lo - start : hi - start] = c + 1
+		masks[lo - start : hi - start] = m | (1 << k if k < 32 else 0)
+		k += 1
+	return counts, masks
+
+
+def _get_zeckendorf_prefix():
+	global _zeckendorf_prefix
+	if _zeckendorf_prefix is None:
+		counts = np.zeros(_ZECKENDORF_PREFIX_LIMIT, np.uint8)
+		masks = np.zeros(_ZECKENDORF_PREFIX_LIMIT, np.uint32)
+		table = _fibonacci_terms
+		for k in itertools.count():
+			lo = table[k]
+			if lo >= _ZECKENDORF_PREFIX_LIMIT:
+				break
+			hi = min(table[k + 1], _ZECKENDORF_PREFIX_LIMIT)
+			counts[lo:hi] = counts[:hi - lo] + 1
+			masks[lo:hi] = masks[:hi - lo] | (1 << k if k < 32 else 0)
+		_zeckendorf_prefix = (counts, masks)
+	return _zeckendorf_prefix
+
+
 def int_bits(n):
 	validate_int(n)
 	while n:
@@ -90,6 +326,133 @@ def validate_int(n, name=None):
 			_suffix_if_not_none(name) + 'Integer must be non-negative')
 
 
+# Fibonacci coding: the Zeckendorf bits of a positive integer, least
+# significant first, followed by a terminating 1 bit, so every code word ends
+# with the only occurrence of "11". Code words are packed into bytes least
+# significant bit first and the last byte is padded with zeros.
+
+_CODEWORD_TABLE_SIZE = 1 << 12
+
+
+def _make_codeword_table():
+	table = [None]
+	for n in range(1, _CODEWORD_TABLE_SIZE):
+		z = encode(n, output_type=int)
+		length = z.bit_length()
+		table.append((z | 1 << length, length + 1))
+	return table
+
+
+def _make_terminator_table():
+	"""Returns a lookup table of the code word terminators in a byte
+
+	For each (pending 1 bit, byte) it holds the bit offsets of the terminators
+	in that byte and whether the byte ends with a pending 1 bit.
+	"""
+	table = ([], [])
+	for pending in range(2):
+		for byte in range(256):
+			ends = []
+			p = pending
+			for i in range(8):
+				if byte >> i & 1:
+					if p:
+						ends.append(i)
+						p = 0
+					else:
+						p = 1
+				else:
+					p = 0
+			table[pending].append((tuple(ends), p))
+	return table
+
+
+_codeword_table = _make_codeword_table()
+_codeword_decode_table = {
+	codeword ^ 1 << (length - 1): n
+	for n, (codeword, length) in enumerate(_codeword_table[1:], 1)
+}
+_terminator_table = _make_terminator_table()
+
+
+def fibonacci_pack(iterable, out=None, chunk_size=1 << 12):
+	"""Writes the Fibonacci codes of the positive integers in iterable
+
+	They go to the binary file object out or are returned as bytes if out is
+	None.
+	"""
+	if out is None:
+		import io
+		with io.BytesIO() as out:
+			fibonacci_pack(iterable, out, chunk_size)
+			return out.getvalue()
+
+	table = _codeword_table
+	acc = bit_count = 0
+	buf = bytearray()
+	for n in iterable:
+		if type(n) is int and 0 < n < _CODEWORD_TABLE_SIZE:
+			codeword, length = table[n]
+		else:
+			validate_int(n)
+			if not n:
+				raise ValueError('Fibonacci coding requires positive integers')
+			codeword = encode(n, output_type=int)
+			length = codeword.bit_length()
+			codeword |= 1 << length
+			length += 1
+
+		acc |= codeword << bit_count
+		bit_count += length
+		if bit_count >= 256:
+			# Keep the accumulator short and move whole bytes to the buffer.
+			size = bit_count // 8
+			buf += (acc & ((1 << size * 8) - 1)).to_bytes(size, 'little')
+			acc >>= size * 8
+			bit_count -= size * 8
+			if len(buf) >= chunk_size:
+				out.write(buf)
+				buf.clear()
+
+	buf += acc.to_bytes(-(-bit_count // 8), 'little')
+	out.write(buf)
+
+
+def fibonacci_unpack(data, chunk_size=1 << 12):
+	"""Lazily yields the integers of a stream of Fibonacci codes
+
+	data may be a bytes-like object or a binary file object.
+	"""
+	if isinstance(data, (bytes, bytearray, memoryview)):
+		data = memoryview(data)
+		chunks = (data[i:i+chunk_size] for i in range(0, len(data), chunk_size))
+	else:
+		chunks = iter(lambda: data.read(chunk_size), b'')
+
+	table = _terminator_table
+	small = _codeword_decode_table
+	pending = 0
+	buf = b''
+	start = 0
+	for chunk in chunks:
+		first = len(buf)
+		buf = buf[start // 8:] + bytes(chunk)
+		first -= start // 8
+		start %= 8
+		for j in range(first, len(buf)):
+			ends, pending = table[pending][buf[j]]
+			for e in ends:
+				end = j * 8 + e
+				bits = int.from_bytes(buf[start // 8 : end // 8 + 1], 'little')
+				bits = (bits >> start % 8) & ((1 << (end - start)) - 1)
+				n = small.get(bits)
+				yield decode(bits) if n is None else n
+				start = end + 1
+
+	if int.from_bytes(buf[start // 8:], 'little') >> start % 8:
+		raise ValueError('Truncated Fibonacci code at the end of the stream')
+
+
 def _suffix_if_not_none(s, suffix=': ', default=''):
 	return default if s is None else s + suffix
 
@@ -107,24 +470,59 @@ MODES = {
 }
 
 
+def _pack_main(numbers):
+	fibonacci_pack(map(int, numbers), sys.stdout.buffer)
+
+
+def _unpack_main(paths):
+	for path in paths:
+		if path == '-':
+			_print_unpacked(sys.stdin.buffer)
+		else:
+			with open(path, 'rb') as f:
+				_print_unpacked(f)
+
+
+def _print_unpacked(f):
+	for n in fibonacci_unpack(f):
+		print(n)
+
+
+STREAM_MODES = {
+	'pack': _pack_main,
+	'unpack': _unpack_main,
+}
+
+
 def parse_args(args):
 	ap = argparse.ArgumentParser()
-	ap.add_argument('numbers', metavar='N', nargs='+')
+	ap.add_argument('numbers', metavar='N', nargs='+',
+		help='Numbers or, with --unpack, files to read ("-" for stdin)')
 
 	ap_mode = ap.add_mutually_exclusive_group(required=True)
-	ap_mode.add_argument('-m', '--mode', choices=MODES)
+	ap_mode.add_argument('-m', '--mode', choices=(*MODES, *STREAM_MODES))
 	for m in MODES:
 		ap_mode.add_argument('-' + m[0], '--' + m,
 			action='store_const', dest='mode', const=m)
+	ap_mode.add_argument('--pack', action='store_const', dest='mode',
+		const='pack', help='Write the Fibonacci codes of N to stdout')
+	ap_mode.add_argument('--unpack', action='store_const', dest='mode',
+		const='unpack', help='Print the numbers coded in the files N')
 
 	args = ap.parse_args(args)
-	args.mode = MODES[args.mode]
+	args.stream_mode = STREAM_MODES.get(args.mode)
+	if args.stream_mode is None:
+		args.mode = MODES[args.mode]
 
 	return args
 
 
 def main(args=None):
 	args = parse_args(args)
+	if args.stream_mode is not None:
+		args.stream_mode(args.numbers)
+		return
+
 	for i in args.numbers:
 		print(i, '->', args.mode(i))
 